@@ -1,9 +1,9 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
-import io
-from model.intern_assign import WORKFORCE_ASSIGN # 최적화 코드 
-from model.make_excel import create_excel_file 
+from model.intern_assign import find_edits, PIN_SHEET, PIN_COLUMNS, PIN_TYPES, OBJECTIVES # 최적화 코드 (pulp 는 solver_worker 에서 로드)
+from model.validate_roster import ROSTER_VALIDATOR, read_roster_excel, style_violations, LEAVE
+from model.solver_worker import SOLVER_WORKER
+# 엑셀/데이터 내보내기 모듈은 결과가 생긴 뒤 처음 사용할 때 불러옴
 
 # -----------------------------------------------------------------------------
 # 1. 초기 설정 (1920x1080 고정)
@@ -24,6 +24,11 @@ if 'uploader_key' not in st.session_state:
 def reset_uploader():
     st.session_state['uploader_key'] += 1
 
+@st.cache_resource
+def get_solver_worker():
+    '''최적화 작업 프로세스 (서버당 1개, 첫 화면 표시와 동시에 warm-up 시작)'''
+    return SOLVER_WORKER()
+
 # -----------------------------------------------------------------------------
 # 3. CSS 스타일
 # -----------------------------------------------------------------------------
@@ -165,9 +170,24 @@ def set_dashboard_style():
     """, unsafe_allow_html=True)
 
 # -----------------------------------------------------------------------------
-# 4. 페이지 함수
+# 4. 사이드바 (최적화 옵션)
+# -----------------------------------------------------------------------------
+def sidebar_options():
+    with st.sidebar:
+        st.markdown('<div class="card-title">⚙️ 최적화 옵션</div>', unsafe_allow_html=True)
+        # 선택 순서가 곧 우선순위 (앞 단계 값을 유지하며 다음 단계 개선)
+        objectives = st.multiselect(
+            "공정성 목적함수 (선택 순서 = 우선순위)",
+            options=list(OBJECTIVES),
+            format_func=lambda k: OBJECTIVES[k],
+        )
+        stage_time = st.slider("단계별 최대 계산 시간(초)", min_value=1, max_value=60, value=10, disabled=not objectives)
+    return objectives, stage_time
+
+# -----------------------------------------------------------------------------
+# 5. 페이지 함수
 # -----------------------------------------------------------------------------
-def page_home():
+def page_home(solver, objectives=None, stage_time=10):
     col_left, col_right = st.columns([5, 5])
 
     # 결과 초기화 
@@ -177,6 +197,9 @@ def page_home():
         st.session_state['group'] = None
         st.session_state['error_log'] = None
         st.session_state['pre_analysis'] = []
+        st.session_state['dept_config'] = None
+        st.session_state['roster'] = None # 수작업 수정 반영된 배정표
+        st.session_state['run_id'] = 0
     
     # -------------------------------------------------------------------------
     # [좌측 패널]
@@ -241,6 +264,10 @@ def page_home():
             if uploaded_file:
                 try:
                     df_raw = pd.read_excel(uploaded_file)
+                    try:
+                        raw_pins = pd.read_excel(uploaded_file, sheet_name=PIN_SHEET)[PIN_COLUMNS]
+                    except (ValueError, KeyError):
+                        raw_pins = pd.DataFrame(columns=PIN_COLUMNS)
                     if df_raw.shape[1] >= 7:
                         workers = int(df_raw.iloc[1,7])
                         raw_df = df_raw.iloc[1:,0:7].fillna(0)
@@ -249,19 +276,35 @@ def page_home():
                         raw_df = pd.DataFrame(columns=['구분','진료과그룹','근무지','인력_Min','인력_Max','월별_Min','월별_Max'])
                 except:
                      raw_df = pd.DataFrame(columns=['구분','진료과그룹','근무지','인력_Min','인력_Max','월별_Min','월별_Max'])
+                     raw_pins = pd.DataFrame(columns=PIN_COLUMNS)
             else:
                 raw_df = pd.DataFrame(columns=['구분','진료과그룹','근무지','인력_Min','인력_Max','월별_Min','월별_Max'])
+                raw_pins = pd.DataFrame(columns=PIN_COLUMNS)
             
             st.markdown("<div style='height: 10px;'></div>", unsafe_allow_html=True)
             
-            # [좌측] 높이 700px
-            df =st.data_editor(
-                raw_df, 
-                use_container_width=True, 
-                hide_index=True, 
-                num_rows="dynamic", 
-                height=700 
-            )
+            # [좌측] 높이 650px (조건 / 배정고정 탭)
+            l_tab1, l_tab2 = st.tabs(["📋 배치 조건", "📌 배정고정"])
+            with l_tab1:
+                df =st.data_editor(
+                    raw_df, 
+                    use_container_width=True, 
+                    hide_index=True, 
+                    num_rows="dynamic", 
+                    height=650 
+                )
+            with l_tab2:
+                # 인력(번호) / 월(0=전년도 마지막 달) / 대상(진료과·근무지) / 유형(고정·금지·휴가)
+                pins = st.data_editor(
+                    raw_pins,
+                    use_container_width=True,
+                    hide_index=True,
+                    num_rows="dynamic",
+                    height=650,
+                    column_config={
+                        '유형': st.column_config.SelectboxColumn('유형', options=PIN_TYPES)
+                    }
+                )
 
     # -------------------------------------------------------------------------
     # [우측 패널] Action & Analysis
@@ -269,23 +312,26 @@ def page_home():
     with col_right:
         with st.container():
             # 헤더: 중앙 정렬 및 여백 확보를 위해 도구 리스트와 액션 비율 조정
-            rh_col1, rh_col2 = st.columns([6, 4], gap="small")
+            rh_col1, rh_col2 = st.columns([4.5, 5.5], gap="small")
             with rh_col1:
                 st.markdown('<div class="card-title" style="margin-top: 5px;">🚀 Action & Analysis</div>', unsafe_allow_html=True)
             with rh_col2:
                 # 버튼 그룹
-                col1, col2 = st.columns([5, 4], gap="small")
+                col1, col2, col3 = st.columns([5, 4, 4], gap="small")
                 with col1:
                     if st.button("⚡ 최적화 실행", type="primary", use_container_width=True, disabled=df.empty):
                         with st.spinner("데이터 분석 중..."):
                             try:
-                                final = WORKFORCE_ASSIGN(df=df,workers=workers,n=3)
-                                final.modeling()
+                                final = solver.solve('WORKFORCE_ASSIGN', df=df,workers=workers,n=3,pins=pins,objectives=objectives,stage_time=stage_time)
                                 
                                 if final.result is not None:
                                     st.session_state['result'] = final.result.reset_index() # 결과 데이터 프레임 생성 및 상태 저장 
                                     st.session_state['human'] = final.worker_counts.reset_index()
                                     st.session_state['group'] = final.dept_counts_by_month.reset_index()
+                                    st.session_state['dept_config'] = final.dept_config
+                                    st.session_state['roster'] = st.session_state['result']
+                                    st.session_state['run_id'] += 1 # 수정 표 초기화
+                                    st.session_state['repair_log'] = None
                                     st.session_state['error_log'] = None
                                     st.session_state['pre_analysis'] = []
                                 else:
@@ -301,6 +347,7 @@ def page_home():
                 with col2:
                     # 엑셀 다운로드 로직
                     if st.session_state.get('result') is not None and not st.session_state['result'].empty:
+                        from model.make_excel import create_excel_file
                         # 엑셀 파일 생성 함수 호출
                         excel_buffer = create_excel_file(
                             st.session_state['result'], 
@@ -320,9 +367,34 @@ def page_home():
                             )
                     else:
                         st.button('📜 Excel 다운', disabled=True, use_container_width=True)
+                with col3:
+                    # 데이터 내보내기 (Parquet / CSV / NDJSON) 로직
+                    if st.session_state.get('result') is not None and not st.session_state['result'].empty:
+                        from model.export_result import create_export_zip, EXPORT_FORMATS
+                        with st.popover("🗂️ 데이터 다운", use_container_width=True):
+                            fmt = st.radio("형식", list(EXPORT_FORMATS), horizontal=True)
+                            try:
+                                export_buffer = create_export_zip(
+                                    st.session_state['result'],
+                                    st.session_state['human'],
+                                    st.session_state['group'],
+                                    st.session_state.get('dept_config'),
+                                    fmt=fmt
+                                )
+                                st.download_button(
+                                    label="📥 다운로드",
+                                    data=export_buffer.getvalue(),
+                                    file_name=f"배정결과_{fmt}.zip",
+                                    mime="application/zip",
+                                    use_container_width=True
+                                )
+                            except ImportError as e:
+                                st.error(str(e))
+                    else:
+                        st.button('🗂️ 데이터 다운', disabled=True, use_container_width=True)
             
             # 탭 구성
-            tab1, tab2, tab3 = st.tabs(["📋 배정결과", "👥 인력별집계", "📊 구분별집계"])
+            tab1, tab2, tab3, tab4 = st.tabs(["📋 배정결과", "👥 인력별집계", "📊 구분별집계", "✅ 규칙검증"])
             
             # Placeholder 함수
             def show_placeholder(icon, text, is_error=False, pre_analysis=None, error_log=None):
@@ -389,12 +461,59 @@ def page_home():
                     else:
                         show_placeholder("👥", "최적화 실행 후<br><b>집계</b>가 표시됩니다.")                    
                 else:
-                    st.dataframe(
+                    # 직접 수정 가능 (수정 내용은 규칙검증 탭에서 즉시 확인)
+                    options = list(st.session_state['dept_config'] or {}) + [LEAVE]
+                    roster = st.data_editor(
                         st.session_state['result'],
                         use_container_width=True, 
-                        height=750,
-                        hide_index=True
+                        height=660,
+                        hide_index=True,
+                        disabled=[st.session_state['result'].columns[0]],
+                        column_config={m: st.column_config.SelectboxColumn(m, options=options) for m in st.session_state['result'].columns[1:]},
+                        key=f"roster_editor_{st.session_state['run_id']}"
                     )
+                    st.session_state['roster'] = roster
+                    try:
+                        violations = ROSTER_VALIDATOR(df, n=3).validate(roster)['violations'] if not df.empty else []
+                        check_error = None
+                    except Exception as e: # 배치 조건 편집 중(불완전한 행 등)에도 결과 탭은 유지
+                        violations, check_error = [], str(e)
+                    unassigned = [v for v in violations if v.startswith('Assignment_1Dept_Per_Month')] # 빈 칸/알 수 없는 값
+                    before = st.session_state['result'].set_index(st.session_state['result'].columns[0])
+                    edited = roster.set_index(roster.columns[0])
+                    edits = find_edits(before, edited)
+
+                    e_col1, e_col2 = st.columns([7, 3], gap="small")
+                    with e_col1:
+                        if st.session_state.get('repair_log'):
+                            st.caption(st.session_state['repair_log'])
+                        if check_error:
+                            st.caption(f"⚠️ 규칙 검증 불가: {check_error} - '📋 배치 조건'을 확인하세요.")
+                        elif unassigned:
+                            st.caption(f"⚠️ 비어 있거나 알 수 없는 칸 {len(unassigned)}개 - 진료과 또는 '{LEAVE}'를 선택해야 재배치할 수 있습니다.")
+                        elif violations:
+                            st.caption(f"⚠️ 규칙 위반 {len(violations)}건 - '✅ 규칙검증' 탭에서 위치를 확인하세요.")
+                        else:
+                            st.caption("✅ 모든 규칙을 충족합니다.")
+                    with e_col2:
+                        # 수정한 칸은 유지하고 주변만 재최적화
+                        if st.button("🔧 수정 반영 재배치", disabled=not edits or df.empty or bool(unassigned) or bool(check_error), use_container_width=True):
+                            with st.spinner("부분 재배치 중..."):
+                                try:
+                                    repair = solver.solve('REPAIR_ASSIGN', df=df, n=3, roster=edited.rename_axis(index=None), edits=edits, pins=pins,
+                                                          objectives=objectives, stage_time=stage_time)
+                                    if repair.result is not None:
+                                        st.session_state['result'] = repair.result.reset_index()
+                                        st.session_state['human'] = repair.worker_counts.reset_index()
+                                        st.session_state['group'] = repair.dept_counts_by_month.reset_index()
+                                        st.session_state['roster'] = st.session_state['result']
+                                        st.session_state['run_id'] += 1 # 수정 표 초기화
+                                        st.session_state['repair_log'] = f"🔧 재배치 완료: 수정 {len(edits)}칸 유지, 주변 {len(repair.changed)}칸 변경"
+                                        st.rerun()
+                                    else:
+                                        st.error(f"재배치 실패: {repair.error_log}")
+                                except Exception as e:
+                                    st.error(f"재배치 중 오류가 발생했습니다: {e}")
 
             with tab2:
                 if st.session_state['result'] is None:
@@ -423,10 +542,51 @@ def page_home():
                         hide_index=True
                     )
 
+            # -----------------------------------------------------------------
+            # [Tab 4] 규칙검증 (수정된 배정표 또는 업로드한 배정표)
+            # -----------------------------------------------------------------
+            with tab4:
+                roster_file = st.file_uploader("배정표 업로드", type=['xlsx'], label_visibility="collapsed", key="roster_uploader")
+                try:
+                    if roster_file:
+                        roster = read_roster_excel(roster_file)
+                    elif st.session_state.get('roster') is not None:
+                        roster = st.session_state['roster']
+                        roster = roster.set_index(roster.columns[0]).rename_axis(index=None)
+                    else:
+                        roster = None
+                    check = ROSTER_VALIDATOR(df, n=3).validate(roster) if roster is not None and not df.empty else None
+                    check_error = None
+                except Exception as e: # 형식이 다른 배정표 업로드, 불완전한 배치 조건 등
+                    check, check_error = None, str(e)
+
+                if check_error:
+                    st.error(f"규칙 검증 중 오류가 발생했습니다: {check_error}")
+                elif check is None:
+                    show_placeholder("✅", "최적화 실행 또는 배정표 업로드 후<br><b>규칙 검증</b>이 표시됩니다.")
+                else:
+                    st.dataframe(
+                        style_violations(roster, check['mask']),
+                        use_container_width=True,
+                        height=450
+                    )
+                    if check['violations']:
+                        st.dataframe(
+                            pd.DataFrame({'위반 규칙': check['violations']}),
+                            use_container_width=True,
+                            height=200,
+                            hide_index=True
+                        )
+                    else:
+                        st.success("모든 규칙을 충족합니다.")
+
 def main():
+    solver = get_solver_worker() # 화면 구성 전에 작업 프로세스부터 띄움
     set_dashboard_style()
-    page_home()
+    objectives, stage_time = sidebar_options()
+    page_home(solver, objectives, stage_time)
 
 
+# 작업 프로세스(spawn)가 이 파일을 다시 import 하므로 main() 은 반드시 이 조건 안에서만 실행
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,155 @@
+'''
+배정 결과 내보내기 (Parquet / CSV / NDJSON)
+인사·급여 시스템이 엑셀 대신 바로 읽을 수 있도록 long-format 레코드로 저장
+'''
+
+# --------------------------------------------
+# 패키지 로드
+import csv
+import io
+import json
+import os
+import zipfile
+
+EXPORT_FORMATS = {'parquet': '.parquet', 'csv': '.csv', 'jsonl': '.jsonl'}
+RECORD_FIELDS = ['Employee', 'Month', 'Period', 'Dept', 'Dept_Group', 'Location']
+BATCH_SIZE = 10000 # parquet row group 단위
+
+# --------------------------------------------
+# 레코드 생성
+
+def _py(value):
+    '''numpy 스칼라 -> 파이썬 기본형 (json 직렬화용)'''
+    return value.item() if hasattr(value, 'item') else value
+
+def iter_assignment_records(result, dept_config=None):
+    '''배정표(Employee x Month)를 한 칸씩 long-format 레코드로 흘려보냄 (pivot/melt 없음)'''
+    dept_config = dept_config or {}
+    months = list(result.columns)
+    for row in result.itertuples(index=True, name=None):
+        employee = row[0]
+        for period, (month, dept) in enumerate(zip(months, row[1:]), start=1):
+            info = dept_config.get(dept, {})
+            yield {
+                'Employee': employee,
+                'Month': month,
+                'Period': period,
+                'Dept': dept,
+                'Dept_Group': info.get('department_group', [None])[0],
+                'Location': info.get('location_group', [None])[0],
+            }
+
+def iter_table_records(table, index_name):
+    '''집계표(worker_counts, dept_counts_by_month)를 행 단위 레코드로 변환'''
+    columns = [str(c) for c in table.columns]
+    for row in table.itertuples(index=True, name=None):
+        record = {index_name: _py(row[0])}
+        record.update({c: _py(v) for c, v in zip(columns, row[1:])})
+        yield record
+
+# --------------------------------------------
+# 포맷별 스트리밍 쓰기
+
+def _write_csv(records, fp, fields):
+    writer = None
+    for record in records:
+        if writer is None:
+            writer = csv.DictWriter(fp, fieldnames=fields or list(record.keys()))
+            writer.writeheader()
+        writer.writerow(record)
+
+def _write_jsonl(records, fp):
+    for record in records:
+        fp.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+def _write_parquet(records, fp, fields):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("parquet 내보내기에는 pyarrow 패키지가 필요합니다. (pip install -r requirements-parquet.txt)") from e
+
+    writer = None
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= BATCH_SIZE:
+            table = pa.Table.from_pylist(batch)
+            writer = writer or pq.ParquetWriter(fp, table.schema)
+            writer.write_table(table)
+            batch.clear()
+
+    if batch or writer is None:
+        # 레코드가 하나도 없으면 필드만 있는 빈 테이블로 스키마 기록
+        table = pa.Table.from_pylist(batch) if batch else \
+                pa.table({f: pa.array([], pa.string()) for f in fields or []})
+        writer = writer or pq.ParquetWriter(fp, table.schema)
+        writer.write_table(table)
+    writer.close()
+
+def write_records(records, fp, fmt, fields=None):
+    '''레코드 제너레이터를 파일 객체(또는 경로)에 순차 기록'''
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"지원하지 않는 형식: {fmt} (가능: {', '.join(EXPORT_FORMATS)})")
+
+    if fmt == 'parquet':
+        _write_parquet(records, fp, fields)
+        return
+
+    if isinstance(fp, (str, os.PathLike)):
+        with open(fp, 'w', encoding='utf-8', newline='') as f:
+            write_records(records, f, fmt, fields)
+        return
+
+    if fmt == 'csv':
+        _write_csv(records, fp, fields)
+    else:
+        _write_jsonl(records, fp)
+
+# --------------------------------------------
+# 결과 전체 내보내기
+
+def _export_tables(result, worker_counts, dept_counts_by_month, dept_config):
+    '''(파일 이름, 레코드 제너레이터, 필드) 목록'''
+    return [
+        ('assignments', iter_assignment_records(result, dept_config), RECORD_FIELDS),
+        ('worker_counts', iter_table_records(worker_counts, 'Employee'), None),
+        ('dept_counts_by_month', iter_table_records(dept_counts_by_month, 'Dept'), None),
+    ]
+
+def export_result(final, out_dir, fmt='parquet'):
+    '''WORKFORCE_ASSIGN 실행 결과를 out_dir 에 형식별 파일로 저장하고 경로 목록 반환'''
+    if getattr(final, 'result', None) is None:
+        raise ValueError("내보낼 배정 결과가 없습니다. modeling() 성공 후 실행하세요.")
+
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for name, records, fields in _export_tables(final.result, final.worker_counts,
+                                                final.dept_counts_by_month, final.dept_config):
+        path = os.path.join(out_dir, name + EXPORT_FORMATS[fmt])
+        write_records(records, path, fmt, fields)
+        paths.append(path)
+    return paths
+
+def create_export_zip(result, human_df, group_df, dept_config=None, fmt='csv'):
+    '''app.py 다운로드용: reset_index 된 세션 데이터프레임 3종을 zip 하나로 묶음'''
+    if result is None or result.empty:
+        return None
+
+    # 세션에는 reset_index() 상태로 저장되므로 첫 열을 다시 인덱스로 사용
+    tables = _export_tables(result.set_index(result.columns[0]),
+                            human_df.set_index(human_df.columns[0]),
+                            group_df.set_index(group_df.columns[0]),
+                            dept_config)
+
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for name, records, fields in tables:
+            with zf.open(name + EXPORT_FORMATS[fmt], 'w') as raw:
+                if fmt == 'parquet':
+                    write_records(records, raw, fmt, fields)
+                else:
+                    with io.TextIOWrapper(raw, encoding='utf-8', newline='') as fp:
+                        write_records(records, fp, fmt, fields)
+    output.seek(0)
+    return output
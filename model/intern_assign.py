@@ -7,10 +7,36 @@
 # --------------------------------------------
 # 패키지 로드 
 import pandas as pd
-import pulp
 import os
 import sys
 from collections import defaultdict
+# pulp 는 모델 생성 시점에 불러옴 (조건 해석·검증만 하는 경우 로드하지 않음, app 은 solver_worker 에서 미리 로드)
+
+# 인력별 고정/금지/휴가 조건 (조건 파일의 '배정고정' 시트)
+PIN_SHEET = '배정고정'
+PIN_COLUMNS = ['인력','월','대상','유형']
+PIN_TYPES = ['고정','금지','휴가','희망'] # 희망: 제약 아님, 'preference' 목적함수에서 반영
+OUT_COUNT_KEY = 'Global_Out' # carry['counts'] 에서 파견 누적 횟수 키
+
+# 공정성 목적함수 (실행 가능해를 찾은 뒤 지정 순서대로 단계별 개선)
+OBJECTIVES = {
+    'group_balance': '진료과 그룹 배치 횟수 균등화',
+    'out_spread': '파견 횟수 균등화',
+    'preference': '희망 배치 반영',
+}
+
+# --------------------------------------------
+# 계획 기간(달력) 설정
+
+def make_periods(years=1, splits=1):
+    """계획 기간 라벨 생성. 기본(1년, 월 단위)은 '1월'~'12월', 반월 단위는 '1월-1','1월-2', 다년은 '2년차 1월'"""
+    periods = []
+    for year in range(years):
+        for month in range(12):
+            for split in range(splits):
+                label = f'{month+1}월' if splits == 1 else f'{month+1}월-{split+1}'
+                periods.append(label if years == 1 else f'{year+1}년차 {label}')
+    return periods
 
 # --------------------------------------------
 # 클래스 설정
@@ -18,14 +44,23 @@ from collections import defaultdict
 class WORKFORCE_ASSIGN:
     
     '''초기 실행'''
-    def __init__(self,df,workers,n):
+    def __init__(self,df,workers,n,pins=None,periods=None,carry=None,prefer=None,objectives=None,stage_time=10):
         self.df = df # 데이터프레임 설정
+        self.pins = pins # 인력별 고정/금지/휴가 조건 (PIN_COLUMNS)
+        self.periods = periods # 계획 기간 라벨 (기본 1월~12월, make_periods 참고)
+        self.carry = carry or {} # 이전 구간에서 넘어온 누적 상태 (ROLLING_ASSIGN 에서 사용)
+        self.prefer = prefer or {} # 가능하면 유지할 배치 {(인력, 월): 진료과} (REPAIR_ASSIGN 에서 사용)
+        self.objectives = list(objectives or []) # 공정성 목적함수 우선순위 (OBJECTIVES 키)
+        self.stage_time = stage_time # 목적함수 단계별 최대 계산 시간(초)
+        self.stage_values = {} # 단계별 목적함수 값
         self.workers = workers
         self.out_group_count = n # 파견병원 총 제한 횟수
         self.continue_work = ['out1'] # 연속 근무 허용
         self.constraints_list = [] # 제약조건 저장 리스트
         self.error_log = None # [신규] 최적화 실패 원인 저장
         self.pre_analysis = [] # [신규] 사전 산술 분석 결과 저장
+        self.presolved_rows = 0 # 사전 고정으로 상수가 되어 제외된 제약 수
+        self.diagnose = True # 불능 시 원인 제약 탐색 여부
         self._setting()
 
     '''설정 실행'''
@@ -58,23 +93,89 @@ class WORKFORCE_ASSIGN:
         ## 근무인력 정리
         self.employees_index = [f'Worker_{x+1}' for x in range(self.workers)] 
 
+        ## 진료과 그룹 설정 (그룹 'A' 는 진료과 단위로 개별 집계)
+        self.department_group_map = defaultdict(list) 
+        for dept, info in self.dept_config.items():
+            group_name = info['department_group'][0]
+            key = dept if group_name == 'A' else group_name
+            self.department_group_map[key].append(dept)
+
         ## 월 설정
-        self.months = [f'{x+1}월' for x in range(12)] 
+        self.months = list(self.periods) if self.periods else make_periods()
+
+        ## 인력별 고정 조건 정리
+        self.pin_table = self._load_pins()
         print('[DEBUG] 조건 파일 로드 완료')
 
+    def _load_pins(self):
+        """배정고정 표 -> (인력, 월 인덱스, 대상, 유형) 목록. 월 0 은 전년도 마지막 근무(이력)"""
+        pin_table = []
+        if self.pins is None or self.pins.empty:
+            return pin_table
+
+        locations = set(info['location_group'][0] for info in self.dept_config.values())
+        for _, row in self.pins.iterrows():
+            worker, month, target, kind = [row[c] for c in PIN_COLUMNS]
+            if pd.isna(worker) or pd.isna(month) or str(worker).strip() == '' or str(month).strip() == '':
+                continue
+
+            # 빈 칸이 섞이면 숫자 열이 float 로 읽힘 (5 -> 5.0)
+            e = worker if str(worker).startswith('Worker_') else f'Worker_{int(float(worker))}'
+            if str(month) in self.months:
+                m_idx = self.months.index(str(month))
+            else:
+                number = pd.to_numeric(str(month).replace('월', '').strip(), errors='coerce')
+                if pd.isna(number) or number != int(number):
+                    raise ValueError(f"배정고정: 잘못된 월 '{month}' ({e})")
+                # 월 번호는 달력의 'N월' 기간으로 연결 (반월/다년 달력에는 없으므로 기간 라벨로 지정해야 함)
+                label = f'{int(number)}월'
+                if number == 0:
+                    m_idx = -1
+                elif label in self.months:
+                    m_idx = self.months.index(label)
+                else:
+                    raise ValueError(f"배정고정: 월 '{month}' 에 해당하는 기간이 없습니다. 기간 라벨(예: '{self.months[0]}')로 지정하세요. ({e})")
+            kind = str(kind).strip()
+            target = '' if pd.isna(target) else str(target).strip()
+
+            if e not in self.employees_index:
+                raise ValueError(f"배정고정: 알 수 없는 인력 '{worker}'")
+            if not -1 <= m_idx < len(self.months):
+                raise ValueError(f"배정고정: 잘못된 월 '{month}' ({e})")
+            if kind not in PIN_TYPES:
+                raise ValueError(f"배정고정: 유형은 {'/'.join(PIN_TYPES)} 중 하나여야 합니다. ('{kind}')")
+            if kind != '휴가' and target not in self.dept_config and target not in locations:
+                raise ValueError(f"배정고정: 알 수 없는 진료과/근무지 '{target}' ({e}, {month})")
+            if m_idx < 0 and kind != '고정':
+                raise ValueError(f"배정고정: 0월(전년도 이력)은 '고정'만 지정할 수 있습니다. ({e})")
+            pin_table.append((e, m_idx, target, kind))
+        return pin_table
+
     '''모델링설정'''
     def modeling(self):
+        import pulp
         #----------------------------------
-        # 0. 사전 산술 분석 (Feasibility Check)
+        # 0. 사전 고정(Presolve) 및 산술 분석 (Feasibility Check)
         #----------------------------------
+        self._presolve()
         self._check_feasibility()
         
         #----------------------------------
         # 정수계획법 setting
         #----------------------------------
         prob = pulp.LpProblem("Intern_Scheduling_Joker_Enabled", pulp.LpMinimize)
-        prob += 0  # 상수 목적함수
-        x = pulp.LpVariable.dicts("x", (self.employees_index, self.months, self.departments), cat='Binary')
+
+        ## 고정된 칸은 상수(0/1), 후보가 여럿인 칸만 변수로 생성
+        x = {e: {m: dict.fromkeys(self.departments, 0) for m in self.months} for e in self.employees_index}
+        for e in self.employees_index:
+            for m_idx, m in enumerate(self.months):
+                allowed = self.allowed[e][m_idx]
+                if len(allowed) == 1:
+                    x[e][m][next(iter(allowed))] = 1
+                else:
+                    for d in allowed:
+                        x[e][m][d] = pulp.LpVariable(f"x_{e}_{m}_{d}", cat='Binary')
+        prob += self._objective(x)
 
         #----------------------------------
         # 제약함수 수집
@@ -83,39 +184,60 @@ class WORKFORCE_ASSIGN:
         ## (제약조건 1) 근무인원은 무조건 월별 1곳 배치
         for e in self.employees_index:
             for m in self.months:
-                self.constraints_list.append((pulp.lpSum([x[e][m][d] for d in self.departments]) == 1, f"Assignment_1Dept_Per_Month_{e}_{m}"))
+                on_duty = 0 if (e, m) in self.leave else 1
+                self._add_constraint(pulp.lpSum([x[e][m][d] for d in self.departments]) == on_duty, f"Assignment_1Dept_Per_Month_{e}_{m}")
         
 
         ## (제약조건 2) 월별로 배치된 진료과 당 인턴 수
         for d in self.departments:
             for m in self.months:
-                self.constraints_list.append((pulp.lpSum([x[e][m][d] for e in self.employees_index]) >= self.dept_config[d]['limit_m'][0], f"Dept_Capacity_Min_{d}_{m}"))
-                self.constraints_list.append((pulp.lpSum([x[e][m][d] for e in self.employees_index]) <= self.dept_config[d]['limit_m'][-1], f"Dept_Capacity_Max_{d}_{m}"))
+                self._add_constraint(pulp.lpSum([x[e][m][d] for e in self.employees_index]) >= self.dept_config[d]['limit_m'][0], f"Dept_Capacity_Min_{d}_{m}")
+                self._add_constraint(pulp.lpSum([x[e][m][d] for e in self.employees_index]) <= self.dept_config[d]['limit_m'][-1], f"Dept_Capacity_Max_{d}_{m}")
         
 
         ## (제약조건 3) 인력별 부서 할당 횟수 (그룹화로 처리)
-        department_group_map = defaultdict(list) 
-        for dept, info in self.dept_config.items():
-            group_name = info['department_group'][0]
-            key = dept if group_name == 'A' else group_name
-            department_group_map[key].append(dept)
-
+        ## 이전 구간 누적 횟수(counts)는 차감, 최소 조건 중 이 구간에서 못 채운 양(short)은 이후 남은 기간(remaining)으로 넘김
+        ## 넘기는 양은 남은 기간에 배치 가능한 횟수(_carry_cap)를 넘을 수 없고, 인력별 합계는 남은 기간 수 이하 (제약조건 4)
+        counts = self.carry.get('counts', {})
+        remaining = self.carry.get('remaining', 0)
+        out_departments = [d for d, info in self.dept_config.items() if info['location_group'][0].startswith('out')]
+        shorts = {e: {'main': [], 'out': []} for e in self.employees_index} # 파견 진료과가 포함된 그룹은 'out'
         for e in self.employees_index:
-            for group_key, d_list in department_group_map.items():
-                min_i = 0
-                max_i = 0
+            for group_key, d_list in self.department_group_map.items():
+                done = counts.get(e, {}).get(group_key, 0)
+                min_i = -done
+                max_i = -done
                 for dept in d_list:
                     min_i += self.dept_config[dept]['limit_i'][0]
                     max_i += self.dept_config[dept]['limit_i'][-1]
-                self.constraints_list.append((pulp.lpSum([x[e][m][d] for m in self.months for d in d_list]) >= min_i, f"Worker_Group_Min_{e}_{group_key}"))
-                self.constraints_list.append((pulp.lpSum([x[e][m][d] for m in self.months for d in d_list]) <= max_i, f"Worker_Group_Max_{e}_{group_key}"))
+                count = pulp.lpSum([x[e][m][d] for m in self.months for d in d_list])
+                if remaining and min_i > 0:
+                    short = pulp.LpVariable(f"Carry_Short_{e}_{group_key}", 0, remaining)
+                    shorts[e]['out' if set(d_list) & set(out_departments) else 'main'].append(short)
+                    self._add_constraint(count + short >= min_i, f"Worker_Group_Min_{e}_{group_key}")
+                    self._add_constraint(short <= self._carry_cap(x[e][self.months[-1]], d_list, remaining), f"Carry_Cap_{e}_{group_key}")
+                else:
+                    self._add_constraint(count >= min_i, f"Worker_Group_Min_{e}_{group_key}")
+                self._add_constraint(count <= max_i, f"Worker_Group_Max_{e}_{group_key}")
         
         
-        ## (제약조건 4) 파견병원은 최대 파견병원 횟수 제한
-        out_departments = [d for d, info in self.dept_config.items() if info['location_group'][0].startswith('out')]
+        ## (제약조건 4) 파견병원은 최대 파견병원 횟수 제한 (최소 횟수도 제약조건 3 과 같은 방식으로 넘김)
+        ## 파견 슬롯은 파견 그룹 최소 조건과 겹칠 수 있으므로 둘 중 큰 값(out_need)만 남은 기간에서 차지
+        self.out_need = {}
         for e in self.employees_index:
-            self.constraints_list.append((pulp.lpSum([x[e][m][d] for m in self.months for d in out_departments]) <= self.out_group_count, f"Global_Out_Max_{e}"))
-            self.constraints_list.append((pulp.lpSum([x[e][m][d] for m in self.months for d in out_departments]) >= self.out_group_count - 2, f"Global_Out_Min_{e}"))
+            done = counts.get(e, {}).get(OUT_COUNT_KEY, 0)
+            count = pulp.lpSum([x[e][m][d] for m in self.months for d in out_departments])
+            self._add_constraint(count <= self.out_group_count - done, f"Global_Out_Max_{e}")
+            if not remaining:
+                self._add_constraint(count >= self.out_group_count - 2 - done, f"Global_Out_Min_{e}")
+                continue
+            short = pulp.LpVariable(f"Carry_Short_{e}_{OUT_COUNT_KEY}", 0, remaining)
+            self._add_constraint(count + short >= self.out_group_count - 2 - done, f"Global_Out_Min_{e}")
+            self._add_constraint(short <= self._carry_cap(x[e][self.months[-1]], out_departments, remaining), f"Carry_Cap_{e}_{OUT_COUNT_KEY}")
+            self.out_need[e] = pulp.LpVariable(f"Carry_Out_{e}", 0, remaining)
+            self._add_constraint(self.out_need[e] >= short, f"Carry_Out_Global_{e}")
+            self._add_constraint(self.out_need[e] >= pulp.lpSum(shorts[e]['out']), f"Carry_Out_Group_{e}")
+            self._add_constraint(pulp.lpSum(shorts[e]['main']) + self.out_need[e] <= remaining, f"Carry_Total_{e}")
       
       
         ## (제약조건 5) 연속 근무 및 장소 그룹 제약
@@ -128,55 +250,94 @@ class WORKFORCE_ASSIGN:
                     for d in d_list:
                         for m_idx in range(len(self.months) - 1):
                             m1, m2 = self.months[m_idx], self.months[m_idx + 1]
-                            self.constraints_list.append((x[e][m1][d] + x[e][m2][d] <= 1, f"No_Cont_Dept_{e}_{d}_{m1}"))
+                            self._add_constraint(pulp.lpSum([x[e][m1][d], x[e][m2][d]]) <= 1, f"No_Cont_Dept_{e}_{d}_{m1}")
                 else:
                     for m_idx in range(len(self.months) - 1):
                         m1, m2 = self.months[m_idx], self.months[m_idx + 1]
-                        self.constraints_list.append((pulp.lpSum([x[e][m1][d] for d in d_list]) + pulp.lpSum([x[e][m2][d] for d in d_list]) <= 1, f"No_Cont_Loc_{e}_{loc}_{m1}"))
+                        self._add_constraint(pulp.lpSum([x[e][m1][d] for d in d_list]) + pulp.lpSum([x[e][m2][d] for d in d_list]) <= 1, f"No_Cont_Loc_{e}_{loc}_{m1}")
 
         ## (제약조건 6) out1 강제 연속 근무 및 배타적 파견
         all_out_depts = [d for d, info in self.dept_config.items() if info['location_group'][0].startswith('out')]
         out1_depts = [d for d, info in self.dept_config.items() if info['location_group'][0] == 'out1']
-        y = pulp.LpVariable.dicts("y_start", (self.employees_index, range(len(self.months)-1)), cat='Binary')
+        ## 시작 불가로 판정된 y 는 0, 강제 시작은 1 로 고정
+        y = {e: {} for e in self.employees_index}
+        for e in self.employees_index:
+            for m in range(len(self.months) - 1):
+                if m in self.y_forced[e]:
+                    y[e][m] = 1
+                elif m in self.y_allowed[e]:
+                    y[e][m] = pulp.LpVariable(f"y_start_{e}_{m}", cat='Binary')
+                else:
+                    y[e][m] = 0
 
         for e in self.employees_index:
-            self.constraints_list.append((pulp.lpSum([y[e][m] for m in range(len(self.months)-1)]) <= 1, f"Out1_Start_MaxOnce_{e}"))
+            self._add_constraint(pulp.lpSum([y[e][m] for m in range(len(self.months)-1)]) <= 1, f"Out1_Start_MaxOnce_{e}")
             for m in range(len(self.months) - 1):
                 m1, m2 = self.months[m], self.months[m+1]
-                self.constraints_list.append((pulp.lpSum([x[e][m1][d] for d in out1_depts]) >= y[e][m], f"Out1_ForcedM1_{e}_{m}"))
-                self.constraints_list.append((pulp.lpSum([x[e][m2][d] for d in out1_depts]) >= y[e][m], f"Out1_ForcedM2_{e}_{m}"))
+                self._add_constraint(pulp.lpSum([x[e][m1][d] for d in out1_depts]) >= y[e][m], f"Out1_ForcedM1_{e}_{m}")
+                self._add_constraint(pulp.lpSum([x[e][m2][d] for d in out1_depts]) >= y[e][m], f"Out1_ForcedM2_{e}_{m}")
                 for d in out1_depts:
-                    self.constraints_list.append((x[e][m1][d] + x[e][m2][d] <= 2 - y[e][m], f"Out1_CrossRule_{e}_{d}_{m}"))
+                    self._add_constraint(pulp.lpSum([x[e][m1][d], x[e][m2][d]]) <= 2 - y[e][m], f"Out1_CrossRule_{e}_{d}_{m}")
                 other_months = [month for month in self.months if month not in [m1, m2]]
-                self.constraints_list.append((pulp.lpSum([x[e][om][d] for om in other_months for d in all_out_depts]) <= 100 * (1 - y[e][m]), f"Out1_Exclusion_OtherOuts_{e}_{m}"))
+                self._add_constraint(pulp.lpSum([x[e][om][d] for om in other_months for d in all_out_depts]) <= 100 * (1 - y[e][m]), f"Out1_Exclusion_OtherOuts_{e}_{m}")
 
         for m in range(len(self.months) - 1):
-            self.constraints_list.append((pulp.lpSum([y[e][m] for e in self.employees_index]) == 1, f"Out1_Monthly_StarterCount_{m}"))
+            self._add_constraint(pulp.lpSum([y[e][m] for e in self.employees_index]) == 1, f"Out1_Monthly_StarterCount_{m}")
+
+        ## (제약조건 7) 구간 최적화 시 이후 기간의 out1 시작 인원 확보
+        ## 이번 구간에서 out1 을 시작하거나 파견을 다녀온 인력은 이후 시작 불가 -> 남은 시작 횟수만큼 남겨둠
+        ## 남겨둔 인력(reserve)은 이후 기간에 out1 두 달이 들어갈 자리도 비워둬야 함 (out_need, 제약조건 4)
+        if remaining > 0:
+            no_start = self.carry.get('no_start', set())
+            eligible = [e for e in self.employees_index if e not in no_start]
+            used = {e: pulp.LpVariable(f"z_used_{e}", cat='Binary') for e in eligible}
+            reserve = {e: pulp.LpVariable(f"z_reserve_{e}", cat='Binary') for e in eligible}
+            for e in eligible:
+                self._add_constraint(pulp.lpSum([y[e][m] for m in range(len(self.months)-1)]) <= used[e], f"Out1_Reserve_Start_{e}")
+                self._add_constraint(pulp.lpSum([x[e][m][d] for m in self.months for d in all_out_depts]) <= len(self.months) * used[e], f"Out1_Reserve_Out_{e}")
+                self._add_constraint(reserve[e] + used[e] <= 1, f"Out1_Reserve_Unused_{e}")
+                self._add_constraint(self.out_need[e] >= min(2, remaining) * reserve[e], f"Out1_Reserve_Room_{e}")
+            self._add_constraint(pulp.lpSum(reserve.values()) >= remaining, "Out1_Reserve_Starters")
+        print(f'[DEBUG] 사전 고정으로 제외된 제약: {self.presolved_rows}개 / 모델 제약: {len(self.constraints_list)}개')
 
         #----------------------------------
         # 초기 제약조건 적용 및 실행
         #----------------------------------
         for ct, name in self.constraints_list:
             prob += ct, name
+        stages = self._stage_objectives(prob, x)
 
         prob.writeLP("intern_debug.lp")
-        prob.solve() 
-        print(f'[DEBUG] 분석상태: {pulp.LpStatus[prob.status]} (code: {prob.status})')
+        # 목적함수 단계를 쓰는 경우 첫 실행(실행 가능해 탐색)에도 같은 단계별 시간 제한 적용
+        prob.solve(pulp.PULP_CBC_CMD(msg=0, timeLimit=self.stage_time) if stages else None)
+        status = pulp.LpStatus[prob.status]
+        print(f'[DEBUG] 분석상태: {status} (code: {prob.status})')
+
+        ## 실행 가능해를 시작점으로 목적함수 단계별 개선
+        if status == 'Optimal' and stages:
+            self._lexicographic(prob, stages)
 
         # 1. 성공한 경우 (Optimal)
-        if pulp.LpStatus[prob.status] == 'Optimal':
+        if status == 'Optimal':
             result_data = []
             for m in self.months:
                 for e in self.employees_index: 
+                    if (e, m) in self.leave:
+                        result_data.append({'Month': m, 'Employee': e, 'Dept': '휴가'})
+                        continue
                     for d in self.departments:
                         val = pulp.value(x[e][m][d])
                         if val is not None and round(val) == 1:
                             result_data.append({'Month': m, 'Employee': e, 'Dept': d})
             
             if result_data:
-                self.result = pd.DataFrame(result_data).pivot(index='Employee', columns='Month', values='Dept')
-                self.result.index = self.employees_index
-                self.result.columns = self.months
+                # pivot 은 인덱스/컬럼을 문자열 정렬하므로(Worker_10 < Worker_2, 10월 < 1월) 원래 순서로 재정렬
+                self.result = pd.DataFrame(result_data).pivot(index='Employee', columns='Month', values='Dept') \
+                                .reindex(index=self.employees_index, columns=self.months) \
+                                .rename_axis(index=None, columns=None)
+                # out1 시작 월 (다음 구간으로 넘길 경계 조건)
+                self.out1_starts = {e: m for e in self.employees_index for m in range(len(self.months) - 1)
+                                    if round(pulp.value(y[e][m]) or 0) == 1}
                 self._short()
                 self.error_log = None
             else:
@@ -184,17 +345,218 @@ class WORKFORCE_ASSIGN:
                 self.error_log = "최적해를 찾았으나 배정 데이터가 생성되지 않았습니다 (모델 설정 오류)."
 
         # 2. 불능인 경우 (Infeasible) -> 진단 루프 실행
-        elif pulp.LpStatus[prob.status] == 'Infeasible':
+        elif status == 'Infeasible':
             self.result = None
-            self._run_diagnostic()
+            if self.diagnose:
+                self._run_diagnostic()
+            else:
+                self.error_log = "최적화 불능(Infeasible)"
 
-        # 3. 기타 오류 (Undefined, Not Solved 등)
+        # 3. 시간 제한 내에 실행 가능해를 찾지 못한 경우
+        elif stages and prob.sol_status == pulp.LpSolutionNoSolutionFound:
+            self.result = None
+            self.error_log = f"최적화 실패: {self.stage_time}초 안에 실행 가능한 배정을 찾지 못했습니다. 단계별 최대 계산 시간을 늘려 주세요."
+            print(f"[ERROR] {self.error_log}")
+
+        # 4. 기타 오류 (Undefined, Not Solved 등)
         else:
             self.result = None
-            self.error_log = f"최적화 실패: {pulp.LpStatus[prob.status]} (데이터가 너무 복잡하거나 제약이 너무 많습니다.)"
+            self.error_log = f"최적화 실패: {status} (데이터가 너무 복잡하거나 제약이 너무 많습니다.)"
             print(f"[ERROR] {self.error_log}")
 
+    def _carry_cap(self, last, d_list, remaining):
+        """남은 기간(remaining)에 d_list 를 배치할 수 있는 최대 횟수 (구간 마지막 기간 배치 last 반영)
+        연속 금지 단위(main 은 진료과, out1 외 근무지는 근무지)마다 최대 ceil(remaining/2)회,
+        남은 기간이 홀수이고 구간 마지막 기간에 같은 단위로 배치되면 1회 감소"""
+        import pulp
+        blocks = defaultdict(list)
+        free = 0 # out1 은 연속 허용 -> 남은 기간 전체
+        for d in d_list:
+            loc = self.dept_config[d]['location_group'][0]
+            if loc in self.continue_work:
+                free = remaining
+            else:
+                blocks[d if loc == 'main' else loc].append(d)
+        half = (remaining + 1) // 2
+        cap = pulp.lpSum([half - (remaining % 2) * pulp.lpSum([last[d] for d in block]) for block in blocks.values()]) + free
+        return cap
+
+    def _objective(self, x):
+        """목적함수: 기본은 상수(실행 가능해 탐색), prefer 가 있으면 기존 배치에서 바뀌는 칸 수 최소화"""
+        import pulp
+        if not self.prefer:
+            return 0
+        return pulp.lpSum([1 - x[e][m][d] for (e, m), d in self.prefer.items() if d in x[e][m]])
+
+    def _stage_objectives(self, prob, x):
+        """공정성 목적함수 식 생성 (최대-최소 차이는 보조 변수 hi/lo 로 선형화)"""
+        import pulp
+        stages = []
+        for name in self.objectives:
+            if name not in OBJECTIVES:
+                raise ValueError(f"알 수 없는 목적함수: {name} (가능: {', '.join(OBJECTIVES)})")
+
+            if name == 'preference':
+                wishes = []
+                for e, m_idx, target, kind in self.pin_table:
+                    if kind != '희망' or m_idx < 0:
+                        continue
+                    m = self.months[m_idx]
+                    d_list = [target] if target in self.dept_config else \
+                             [d for d, info in self.dept_config.items() if info['location_group'][0] == target]
+                    wishes.append(1 - pulp.lpSum([x[e][m][d] for d in d_list]))
+                expr = pulp.lpSum(wishes)
+            else:
+                if name == 'out_spread':
+                    groups = {OUT_COUNT_KEY: [d for d, info in self.dept_config.items() if info['location_group'][0].startswith('out')]}
+                else:
+                    groups = self.department_group_map
+                ## 이전 구간 누적 횟수(carry)를 더해 전체 계획 기간 기준으로 균등화
+                counts = self.carry.get('counts', {})
+                spreads = []
+                for key, d_list in groups.items():
+                    hi = pulp.LpVariable(f"Fair_Hi_{name}_{key}")
+                    lo = pulp.LpVariable(f"Fair_Lo_{name}_{key}")
+                    for e in self.employees_index:
+                        count = pulp.lpSum([x[e][m][d] for m in self.months for d in d_list]) + counts.get(e, {}).get(key, 0)
+                        prob += count <= hi, f"Fair_Hi_{name}_{key}_{e}"
+                        prob += count >= lo, f"Fair_Lo_{name}_{key}_{e}"
+                    spreads.append(hi - lo)
+                expr = pulp.lpSum(spreads)
+            stages.append((name, expr))
+
+        # 상수 목적함수는 pulp 가 임시 변수(__dummy)를 넣고 남겨두어 목적함수 교체 후 CBC 입력 오류 발생
+        # -> 0 으로 고정된 변수를 모든 단계 목적함수에 포함
+        if stages:
+            zero = pulp.LpVariable("Lex_Zero", 0, 0)
+            stages = [(name, expr + zero) for name, expr in stages]
+            if prob.objective is None or prob.objective.isNumericalConstant():
+                prob.setObjective(zero)
+        return stages
+
+    def _lexicographic(self, prob, stages):
+        """이전 단계 해를 warm start 로, 이전 단계 값을 제약으로 두고 목적함수를 순서대로 최적화"""
+        import pulp
+        solver = pulp.PULP_CBC_CMD(msg=0, warmStart=True, timeLimit=self.stage_time)
+        if self.prefer: # 기존 배치 유지(prefer)도 이후 단계에서 나빠지지 않도록 고정
+            prob += prob.objective <= pulp.value(prob.objective) + 1e-6, "Lex_prefer"
+        for name, expr in stages:
+            previous = {v.name: v.varValue for v in prob.variables()}
+            for v in prob.variables():
+                if v.varValue is not None:
+                    v.setInitialValue(v.varValue)
+
+            prob.setObjective(expr)
+            prob.solve(solver)
+            if prob.sol_status not in (pulp.LpSolutionOptimal, pulp.LpSolutionIntegerFeasible):
+                # 시간 내 해를 못 찾으면 이전 단계 해를 유지하고 중단
+                for v in prob.variables():
+                    v.varValue = previous.get(v.name)
+                print(f'[DEBUG] 목적함수 {name}: 시간 내 개선 실패, 이전 단계 해 유지')
+                break
+
+            value = pulp.value(expr)
+            self.stage_values[name] = value
+            prob += expr <= value + 1e-6, f"Lex_{name}"
+            print(f'[DEBUG] 목적함수 {name}: {value:g} ({"최적" if prob.sol_status == pulp.LpSolutionOptimal else "시간 제한"})')
+
+    def _add_constraint(self, ct, name):
+        """변수가 모두 고정되어 상수가 된 제약은 제외 (위반된 상수 제약은 남겨서 진단 대상으로 둠)"""
+        if not ct.keys() and ct.valid():
+            self.presolved_rows += 1
+            return
+        self.constraints_list.append((ct, name))
+
+    def _presolve(self):
+        """고정/금지/휴가 조건을 변수 고정·제거로 반영하고, 연속근무(제약 5)·out1(제약 6) 규칙으로 전파"""
+        T = len(self.months)
+        loc_of = {d: info['location_group'][0] for d, info in self.dept_config.items()}
+        out_depts = {d for d, loc in loc_of.items() if loc.startswith('out')}
+        out1_depts = {d for d, loc in loc_of.items() if loc == 'out1'}
+
+        ## 칸별 배치 가능 진료과 (e, 월 인덱스) -> set
+        self.allowed = {e: [set(self.departments) for _ in self.months] for e in self.employees_index}
+        self.leave = set() # (인력, 월) 휴가
+        history = {} # 전년도 마지막 달 근무 (0월)
+        for e, m_idx, target, kind in self.pin_table:
+            targets = {target} if target in self.dept_config else {d for d, loc in loc_of.items() if loc == target}
+            if m_idx < 0:
+                history[e] = history.get(e, set(self.departments)) & targets
+            elif kind == '고정':
+                self.allowed[e][m_idx] &= targets
+            elif kind == '금지':
+                self.allowed[e][m_idx] -= targets
+            elif kind == '휴가':
+                self.allowed[e][m_idx].clear()
+                self.leave.add((e, self.months[m_idx]))
+
+        ## 인접 월에서 금지되는 진료과 (제약 5 와 동일 규칙)
+        def blocked_next(cell):
+            locs = {loc_of[d] for d in cell}
+            if len(locs) != 1:
+                return set()
+            loc = locs.pop()
+            if loc == 'main':
+                return set(cell) if len(cell) == 1 else set()
+            if loc == 'out1':
+                return set()
+            return {d for d, l in loc_of.items() if l == loc}
+
+        ## 이전 구간에서 이미 out1 을 시작했거나 다른 파견이 있었던 인력은 새로 시작 불가
+        no_start = self.carry.get('no_start', set())
+        self.y_allowed = {e: set() if e in no_start else set(range(T - 1)) for e in self.employees_index} # out1 시작 가능 월
+        self.y_forced = {e: set() for e in self.employees_index} # out1 시작 확정 월
+
+        changed = True
+        while changed:
+            changed = False
+            for e in self.employees_index:
+                cells = self.allowed[e]
+
+                # (제약 5) 확정된 칸의 앞뒤 달에서 같은 과/근무지 제거
+                for m_idx in range(-1, T):
+                    cell = history.get(e, set()) if m_idx < 0 else cells[m_idx]
+                    banned = blocked_next(cell)
+                    for n_idx in (m_idx - 1, m_idx + 1):
+                        if 0 <= n_idx < T and cells[n_idx] & banned:
+                            cells[n_idx] -= banned
+                            changed = True
+
+                # (제약 6) 두 달 연속 out1 이 불가능하거나, 그 외 달에 파견이 확정이면 시작 불가
+                forced_out = [k for k in range(T) if cells[k] and cells[k] <= out_depts]
+                for k in list(self.y_allowed[e]):
+                    if not (cells[k] & out1_depts and cells[k + 1] & out1_depts) \
+                            or any(f not in (k, k + 1) for f in forced_out):
+                        self.y_allowed[e].discard(k)
+                        changed = True
+
+            # (제약 6) 해당 월에 시작 가능한 인력이 한 명뿐이면 시작 확정
+            for k in range(T - 1):
+                candidates = [e for e in self.employees_index if k in self.y_allowed[e]]
+                if len(candidates) != 1 or k in self.y_forced[candidates[0]]:
+                    continue
+                e = candidates[0]
+                cells = self.allowed[e]
+                self.y_forced[e].add(k)
+                self.y_allowed[e] = {k}
+                for m_idx in range(T):
+                    if m_idx in (k, k + 1):
+                        cells[m_idx] &= out1_depts
+                    else:
+                        cells[m_idx] -= out_depts
+                changed = True
+
+        ## 결과 요약
+        fixed = sum(len(cell) <= 1 for e in self.employees_index for cell in self.allowed[e])
+        removed = sum(len(self.departments) - len(cell) for e in self.employees_index for cell in self.allowed[e])
+        for e in self.employees_index:
+            for m_idx, m in enumerate(self.months):
+                if not self.allowed[e][m_idx] and (e, m) not in self.leave:
+                    self.pre_analysis.append(f"❌ 배정고정 충돌: {e} {m}에 배치 가능한 진료과가 없습니다.")
+        print(f'[DEBUG] 사전 고정 완료: 확정 칸 {fixed}개, 제거 변수 {removed}개')
+
     def _run_diagnostic(self):
+        import pulp
         print("\n" + "="*50)
         print("[CRITICAL] 최적화 불능(Infeasible) 발생. 원인 분석을 시작합니다...")
         print(f"총 제약조건 {len(self.constraints_list)}개를 대상으로 이진 탐색을 수행합니다.")
@@ -234,10 +596,10 @@ class WORKFORCE_ASSIGN:
         print("[DEBUG] 사전 산술 분석 시작...")
         
         # 1. 전체 공급 vs 전체 최소 수요
-        total_supply = self.workers * 12
+        total_supply = self.workers * len(self.months) - len(self.leave)
         total_min_demand = 0
         for d in self.departments:
-            total_min_demand += self.dept_config[d]['limit_m'][0] * 12
+            total_min_demand += self.dept_config[d]['limit_m'][0] * len(self.months)
         
         if total_min_demand > total_supply:
             self.pre_analysis.append(f"❌ 전체 인력 부족: 총 공급 {total_supply}개월분 < 총 최소 요구 {total_min_demand}개월분 (최소 {total_min_demand - total_supply}개월분의 인력이 더 필요합니다.)")
@@ -246,7 +608,7 @@ class WORKFORCE_ASSIGN:
         out_departments = [d for d, info in self.dept_config.items() if info['location_group'][0].startswith('out1')]
         total_out_min_demand = 0
         for d in out_departments:
-            total_out_min_demand += self.dept_config[d]['limit_m'][0] * 12
+            total_out_min_demand += self.dept_config[d]['limit_m'][0] * len(self.months)
         
         max_out_capacity = self.workers * self.out_group_count
         if total_out_min_demand > max_out_capacity:
@@ -267,9 +629,226 @@ class WORKFORCE_ASSIGN:
                                     .reindex(index=self.departments, fill_value=0) \
                                     .fillna(0).astype(int)
 
+class ROLLING_ASSIGN(WORKFORCE_ASSIGN):
+    
+    '''긴 계획 기간(다년, 반월 단위 등)을 겹치는 구간으로 나누어 순차 최적화
+    window: 한 번에 푸는 기간 수, step: 매 구간에서 확정하는 기간 수 (나머지는 다음 구간과 겹침)
+    '''
+    def __init__(self,df,workers,n,pins=None,periods=None,window=6,step=4,objectives=None,stage_time=10):
+        super().__init__(df,workers,n,pins=pins,periods=periods,objectives=objectives,stage_time=stage_time)
+        if not 1 <= step <= window:
+            raise ValueError(f"구간 설정 오류: 1 <= step({step}) <= window({window}) 이어야 합니다.")
+        if step == window < len(self.months):
+            # 구간이 겹치지 않으면 경계 기간 쌍의 out1 시작 조건이 어느 구간에도 들어가지 않음
+            raise ValueError(f"구간 설정 오류: 구간이 겹치도록 step({step}) < window({window}) 이어야 합니다.")
+        self.window = window
+        self.step = step
+
+    '''구간별 모델링'''
+    def modeling(self):
+        T = len(self.months)
+        self.roster = {e: [None] * T for e in self.employees_index} # 확정된 배치
+        self.out1_starts = {} # 확정된 out1 시작 기간 (전체 기준)
+
+        ## 구간이 불능이면 구간을 step 만큼 넓혀 재시도, 끝까지 넓혀도 불능이면 직전 구간의 확정을 되돌리고
+        ## 그 시작점부터 남은 기간 전체를 다시 최적화 (최악의 경우 전체 기간 한 번에 최적화)
+        committed = [] # 확정한 구간의 시작 기간 (되돌리기용)
+        t0, size = 0, self.window
+        while t0 < T:
+            t1 = min(t0 + size, T)
+            commit_end = T if t1 == T else t0 + self.step
+            print(f'[DEBUG] 구간 최적화: {self.months[t0]} ~ {self.months[t1-1]} (확정: ~{self.months[commit_end-1]})')
+
+            sub = WORKFORCE_ASSIGN(df=self.df, workers=self.workers, n=self.out_group_count,
+                                   pins=self._window_pins(t0, t1), periods=self.months[t0:t1],
+                                   carry=self._window_carry(t0, t1),
+                                   objectives=self.objectives, stage_time=self.stage_time)
+            sub.diagnose = t0 == 0 and t1 == T # 중간 단계 불능은 구간 확대/되돌리기로 처리
+            sub.modeling()
+            self.constraints_list = sub.constraints_list
+
+            if sub.result is None:
+                if t1 < T:
+                    print(f'[DEBUG] 구간 불능: {self.months[t0]} ~ {self.months[t1-1]}, 구간 확대 후 재시도')
+                    size += self.step
+                    continue
+                if committed:
+                    t0 = committed.pop()
+                    size = T - t0
+                    self.out1_starts = {e: k for e, k in self.out1_starts.items() if k < t0}
+                    print(f'[DEBUG] 남은 기간 불능: {self.months[t0]} 부터 확정 취소 후 재시도')
+                    continue
+                self.result = None
+                self.error_log = f"[{self.months[t0]}~{self.months[t1-1]} 구간] {sub.error_log}"
+                self.pre_analysis = sub.pre_analysis
+                return
+
+            ## 앞쪽 step 기간만 확정, 나머지는 다음 구간에서 다시 최적화
+            for e in self.employees_index:
+                for t in range(t0, commit_end):
+                    self.roster[e][t] = sub.result.loc[e, self.months[t]]
+            for e, k in sub.out1_starts.items():
+                if t0 + k < commit_end:
+                    self.out1_starts[e] = t0 + k
+            committed.append(t0)
+            t0, size = commit_end, self.window
+
+        self.result = pd.DataFrame.from_dict(self.roster, orient='index', columns=self.months) \
+                        .reindex(index=self.employees_index)
+
+        ## 구간을 이어 붙인 결과를 전체 기간 규칙으로 재검증 (구간 경계 규칙 누락 방지)
+        try:
+            from model.validate_roster import ROSTER_VALIDATOR
+        except ModuleNotFoundError: # model 폴더에서 직접 실행하는 경우
+            from validate_roster import ROSTER_VALIDATOR
+        violations = ROSTER_VALIDATOR(self.df, n=self.out_group_count).validate(self.result)['violations']
+        if violations:
+            print('[ERROR] 구간 결합 결과 규칙 위반:', *violations, sep='\n')
+            self.result = None
+            self.error_log = f"구간 결합 결과 규칙 위반 {len(violations)}건: {violations[0]}"
+            self.pre_analysis = violations
+            return
+
+        self._short()
+        self.error_log = None
+
+    def _window_pins(self, t0, t1):
+        """사용자 고정 조건 + 경계 조건(직전 기간 배치, 진행 중인 out1)을 구간 기준 배정고정 표로 변환"""
+        loc_of = {d: info['location_group'][0] for d, info in self.dept_config.items()}
+        out_locations = sorted(set(loc for loc in loc_of.values() if loc.startswith('out')))
+        rows = []
+
+        ## 사용자 조건 (0월 이력은 첫 구간에만 적용), 월은 기간 라벨로 전달
+        for e, m_idx, target, kind in self.pin_table:
+            if t0 <= m_idx < t1 or (m_idx < 0 and t0 == 0):
+                rows.append([e, self.months[m_idx] if m_idx >= 0 else 0, target, kind])
+
+        if t0 == 0:
+            return pd.DataFrame(rows, columns=PIN_COLUMNS)
+
+        for e in self.employees_index:
+            ## 직전 기간 배치 -> 0월 이력 (연속 근무 금지)
+            last = self.roster[e][t0 - 1]
+            if last in self.dept_config:
+                rows.append([e, 0, last, '고정'])
+
+            ## out1 진행 중: 첫 기간은 다른 out1 진료과, 이후 파견 금지
+            start = self.out1_starts.get(e)
+            if start is None:
+                continue
+            if start == t0 - 1:
+                rows.append([e, self.months[t0], 'out1', '고정'])
+                rows.append([e, self.months[t0], last, '금지'])
+            for t in range(max(start + 2, t0), t1):
+                rows.extend([e, self.months[t], loc, '금지'] for loc in out_locations)
+        return pd.DataFrame(rows, columns=PIN_COLUMNS)
+
+    def _window_carry(self, t0, t1):
+        """확정된 기간의 그룹별/파견 누적 횟수와 out1 재시작 금지 인력"""
+        out_departments = {d for d, info in self.dept_config.items() if info['location_group'][0].startswith('out')}
+        counts = {}
+        no_start = set()
+        for e in self.employees_index:
+            done = self.roster[e][:t0]
+            counts[e] = {key: sum(d in d_list for d in done) for key, d_list in self.department_group_map.items()}
+            counts[e][OUT_COUNT_KEY] = sum(d in out_departments for d in done)
+            if e in self.out1_starts or counts[e][OUT_COUNT_KEY] > 0:
+                no_start.add(e)
+        return {'counts': counts, 'remaining': len(self.months) - t1, 'no_start': no_start}
+
+def find_edits(before, after):
+    """두 배정표(Employee x Month)에서 값이 달라진 칸 [(인력, 월), ...]"""
+    diff = before.ne(after) & ~(before.isna() & after.isna())
+    return [(e, m) for e, m in diff.stack().loc[lambda v: v].index]
+
+class REPAIR_ASSIGN(WORKFORCE_ASSIGN):
+    
+    '''완성된 배정표에서 수정된 칸 주변만 다시 최적화 (Large Neighbourhood Search)
+    roster: 현재 배정표 (Employee x Month, 수정 반영), edits: 수정된 칸 [(인력, 월), ...]
+    '''
+    def __init__(self,df,n,roster,edits,pins=None,radius=1,objectives=None,stage_time=10):
+        self.roster = roster
+        self.edits = list(edits)
+        self.radius = radius # 첫 이웃 범위 (수정 월 기준 앞뒤 기간 수), 불능이면 2배씩 확대
+        super().__init__(df,len(roster),n,pins=pins,periods=list(roster.columns),objectives=objectives,stage_time=stage_time)
+
+        ## 수정 칸은 그대로 고정되므로 비었거나 알 수 없는 값이면 미리 중단
+        for e, m in self.edits:
+            value = self.roster.loc[e, m]
+            if pd.isna(value) or str(value).strip() == '':
+                raise ValueError(f"재배치: 비어 있는 칸은 유지할 수 없습니다. 진료과 또는 '휴가'를 선택하세요. ({e}, {m})")
+            if value != '휴가' and value not in self.dept_config:
+                raise ValueError(f"재배치: 알 수 없는 진료과 '{value}' ({e}, {m})")
+
+    '''이웃 범위만 풀어서 모델링'''
+    def modeling(self):
+        T = len(self.months)
+        radius = self.radius
+        while True:
+            free = self._neighbourhood(radius)
+            print(f'[DEBUG] 부분 재배치: 범위 {radius}, 재최적화 칸 {len(free)}개')
+            sub = WORKFORCE_ASSIGN(df=self.df, workers=self.workers, n=self.out_group_count,
+                                   pins=self._repair_pins(free), periods=self.months,
+                                   prefer={cell: self.roster.loc[cell] for cell in free},
+                                   objectives=self.objectives, stage_time=self.stage_time)
+            sub.diagnose = radius >= T # 중간 단계 불능은 범위 확대로 처리
+            sub.modeling()
+            if sub.result is not None or radius >= T:
+                break
+            radius *= 2
+
+        self.constraints_list = sub.constraints_list
+        self.pre_analysis = sub.pre_analysis
+        if sub.result is None:
+            self.result = None
+            self.error_log = sub.error_log
+            return
+
+        self.result = sub.result
+        self.changed = [(e, m) for e in self.employees_index for m in self.months
+                        if (e, m) not in self.edits and self.result.loc[e, m] != self.roster.loc[e, m]]
+        print(f'[DEBUG] 부분 재배치 완료: 변경 {len(self.changed)}칸')
+        self._short()
+        self.error_log = None
+
+    def _neighbourhood(self, radius):
+        """재최적화할 칸: 수정된 인력의 앞뒤 radius 기간 + 전체 인력의 앞뒤 radius-1 기간 (수정 칸 제외)"""
+        affected = {e for e, _ in self.edits}
+        free = set()
+        for e, m in self.edits:
+            t = self.months.index(m)
+            for u in range(max(0, t - radius), min(len(self.months), t + radius + 1)):
+                workers = self.employees_index if abs(u - t) < radius else affected
+                free.update((w, self.months[u]) for w in workers)
+        return free - set(self.edits)
+
+    def _repair_pins(self, free):
+        """이웃 밖 칸과 수정 칸은 현재 값으로 고정, 이웃 안 칸은 사용자 고정 조건만 적용"""
+        rows = [[e, self.months[m_idx] if m_idx >= 0 else 0, target, kind] for e, m_idx, target, kind in self.pin_table
+                if m_idx < 0 or (e, self.months[m_idx]) in free]
+        for e in self.employees_index:
+            for m in self.months:
+                if (e, m) in free:
+                    continue
+                dept = self.roster.loc[e, m]
+                rows.append([e, m, '', '휴가'] if dept == '휴가' else [e, m, dept, '고정'])
+        return pd.DataFrame(rows, columns=PIN_COLUMNS)
+
 # --------------------------------------------
 
 if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser(description='인턴 인력 배치 최적화')
+    parser.add_argument('--export', metavar='DIR', help='배정 결과를 저장할 폴더 (지정 시 내보내기 실행)')
+    parser.add_argument('--format', default='parquet', choices=['parquet', 'csv', 'jsonl'], help='내보내기 형식')
+    parser.add_argument('--years', type=int, default=1, help='계획 기간 (년)')
+    parser.add_argument('--splits', type=int, default=1, help='월별 분할 수 (2 = 반월 단위)')
+    parser.add_argument('--window', type=int, help='구간 최적화 기간 수 (지정 시 Rolling Horizon 실행)')
+    parser.add_argument('--step', type=int, help='구간별 확정 기간 수 (기본: window 의 2/3)')
+    parser.add_argument('--objectives', nargs='*', default=[], choices=list(OBJECTIVES), help='공정성 목적함수 (우선순위 순)')
+    parser.add_argument('--stage-time', type=int, default=10, help='목적함수 단계별 최대 계산 시간(초)')
+    args = parser.parse_args()
+
     # 실행 파일(.exe)의 위치 파악
     if getattr(sys, 'frozen', False):
         current_path = os.path.dirname(sys.executable)
@@ -288,6 +867,25 @@ if __name__ == '__main__':
     df.columns = ['구분','진료과그룹','근무지','인력_Min','인력_Max','월별_Min','월별_Max']
     df = df.fillna(0) # 칼럼 정리
 
+    # 인력별 고정/금지/휴가 조건 (시트가 없으면 미적용)
+    try:
+        pins = pd.read_excel(PATH_FILE, sheet_name=PIN_SHEET)[PIN_COLUMNS]
+    except ValueError:
+        pins = None
+
     # 클래스 실행
-    final = WORKFORCE_ASSIGN(df=df,workers=workers,n=3)
-    final.modeling()
\ No newline at end of file
+    periods = make_periods(years=args.years, splits=args.splits)
+    if args.window:
+        step = args.step or max(1, args.window * 2 // 3) # window 가 1 이면 구간이 겹칠 수 없어 오류
+        final = ROLLING_ASSIGN(df=df,workers=workers,n=3,pins=pins,periods=periods,window=args.window,step=step,
+                               objectives=args.objectives,stage_time=args.stage_time)
+    else:
+        final = WORKFORCE_ASSIGN(df=df,workers=workers,n=3,pins=pins,periods=periods,
+                                 objectives=args.objectives,stage_time=args.stage_time)
+    final.modeling()
+
+    # 결과 내보내기 (Parquet / CSV / NDJSON)
+    if args.export and final.result is not None:
+        from export_result import export_result
+        for path in export_result(final, args.export, fmt=args.format):
+            print(f'[DEBUG] 내보내기 완료: {path}')
\ No newline at end of file
@@ -0,0 +1,82 @@
+'''
+최적화 전용 작업 프로세스 (app 시작 시 미리 띄워 첫 실행 지연 제거)
+pulp/pandas/모델 모듈 로드와 CBC 첫 실행을 시작 시점에 끝내 두고, 작업 프로세스가 비어 있으면 그곳에서 실행
+다른 요청을 처리 중이면 기다리지 않고 요청한 세션의 스레드에서 바로 실행 (세션 간 대기 없음)
+'''
+
+# --------------------------------------------
+# 패키지 로드
+import atexit
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from types import SimpleNamespace
+
+MODELS = ('WORKFORCE_ASSIGN', 'REPAIR_ASSIGN') # 작업 프로세스에서 실행 가능한 모델
+RESULT_FIELDS = ['result', 'worker_counts', 'dept_counts_by_month', 'dept_config', 'error_log', 'pre_analysis', 'changed']
+
+# --------------------------------------------
+# 작업 프로세스에서 실행되는 함수 (pickle 가능하도록 모듈 최상위에 정의)
+
+def _load_model(name):
+    try:
+        import model.intern_assign as intern_assign
+    except ModuleNotFoundError: # model 폴더에서 직접 실행하는 경우
+        import intern_assign
+    return getattr(intern_assign, name)
+
+def _warm_up():
+    '''모듈 로드 + 1변수 문제 풀이로 CBC 실행 파일까지 한 번 실행'''
+    import pulp
+    _load_model(MODELS[0])
+    prob = pulp.LpProblem("Warm_Up", pulp.LpMinimize)
+    v = pulp.LpVariable("warm_up", cat='Binary')
+    prob += v
+    prob += v >= 0, "Warm_Up_Bound"
+    prob.solve(pulp.PULP_CBC_CMD(msg=0))
+    return pulp.LpStatus[prob.status]
+
+def _solve(name, kwargs):
+    '''모델 실행 후 화면 표시에 필요한 결과만 반환 (pulp 객체는 프로세스 밖으로 보내지 않음)'''
+    final = _load_model(name)(**kwargs)
+    final.modeling()
+    return {field: getattr(final, field, None) for field in RESULT_FIELDS}
+
+# --------------------------------------------
+# 클래스 설정
+
+class SOLVER_WORKER:
+
+    '''작업 프로세스 1개를 띄우고 바로 warm-up 실행 (완료를 기다리지 않음)'''
+    def __init__(self):
+        self._busy = threading.Lock() # 작업 프로세스 사용 중 여부
+        self._start()
+        atexit.register(self.close)
+
+    def _start(self):
+        # streamlit 서버는 다중 스레드이므로 fork 대신 spawn 사용
+        self.pool = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn'))
+        self.warm = self.pool.submit(_warm_up)
+
+    '''모델 실행 (kwargs 는 모델 생성자 인자 그대로)'''
+    def solve(self, name, **kwargs):
+        if name not in MODELS:
+            raise ValueError(f"알 수 없는 모델: {name} (가능: {', '.join(MODELS)})")
+        if not self._busy.acquire(blocking=False):
+            # 다른 세션의 최적화가 작업 프로세스를 쓰는 중: 줄 세우지 않고 현재 스레드에서 실행
+            return SimpleNamespace(**_solve(name, kwargs))
+        try:
+            fields = self.pool.submit(_solve, name, kwargs).result()
+        except BrokenProcessPool:
+            # 작업 프로세스가 비정상 종료된 경우: 다음 요청을 위해 다시 띄우고 이번 요청은 현재 프로세스에서 실행
+            print("[WARN] 최적화 작업 프로세스 재시작")
+            self.pool.shutdown(wait=False)
+            self._start()
+            fields = _solve(name, kwargs)
+        finally:
+            self._busy.release()
+        return SimpleNamespace(**fields)
+
+    def close(self):
+        self.pool.shutdown(wait=False)
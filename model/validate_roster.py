@@ -0,0 +1,182 @@
+'''
+배정표 규칙 검증 (수작업 수정 후 재최적화 없이 즉시 확인)
+modeling() 의 제약조건을 numpy 배열 연산으로 평가하여 칸 단위 위반 마스크를 반환
+'''
+
+# --------------------------------------------
+# 패키지 로드
+import numpy as np
+import pandas as pd
+
+try:
+    from model.intern_assign import WORKFORCE_ASSIGN
+except ModuleNotFoundError: # model 폴더에서 직접 실행하는 경우
+    from intern_assign import WORKFORCE_ASSIGN
+
+LEAVE = '휴가' # 미배치 허용 값
+
+# --------------------------------------------
+# 엑셀 읽기
+
+def read_roster_excel(file):
+    '''create_excel_file 결과(또는 같은 형태의 배정표) -> Employee x Month 데이터프레임'''
+    raw = pd.read_excel(file, sheet_name=0)
+
+    # 첫 번째 표만 사용 (오른쪽 인력별 집계 / 아래 구분별 집계는 빈 열·빈 행으로 구분됨)
+    # 첫 열은 인력 이름 (result.to_excel() 은 머리글이 비어 'Unnamed: 0' 으로 읽힘)
+    blank_cols = [i for i, c in enumerate(raw.columns)
+                  if i > 0 and str(c).startswith('Unnamed') and raw.iloc[:, i].isna().all()]
+    if blank_cols:
+        raw = raw.iloc[:, :blank_cols[0]]
+    blank_rows = np.flatnonzero(raw.isna().all(axis=1).to_numpy())
+    if len(blank_rows):
+        raw = raw.iloc[:blank_rows[0]]
+    return raw.set_index(raw.columns[0]).rename_axis(index=None)
+
+# --------------------------------------------
+# 클래스 설정
+
+class ROSTER_VALIDATOR:
+
+    '''조건표(df) 기준 검증기. 배정표마다 validate() 호출'''
+    def __init__(self,df,n):
+        self.out_group_count = n
+        df = df.dropna(subset=['구분', '근무지']) # 편집 중 추가된 빈 행 제외
+        config = WORKFORCE_ASSIGN(df=df, workers=0, n=n) # 조건 해석은 최적화 모델과 동일하게
+        self.dept_config = config.dept_config
+        self.departments = config.departments
+        self.group_keys = list(config.department_group_map.keys())
+        self._setting(config.department_group_map)
+
+    '''진료과 속성 배열 설정 (마지막 칸은 미배치/알 수 없는 값용)'''
+    def _setting(self, department_group_map):
+        D = len(self.departments)
+        locs = [str(self.dept_config[d]['location_group'][0]) for d in self.departments] # 빈 칸이 0 으로 채워진 경우 등
+        loc_names = sorted(set(locs))
+
+        self.loc_code = np.array([loc_names.index(l) for l in locs] + [-1])
+        self.is_main = np.array([l == 'main' for l in locs] + [False])
+        self.is_out = np.array([l.startswith('out') for l in locs] + [False])
+        self.is_out1 = np.array([l == 'out1' for l in locs] + [False])
+        self.loc_rule = ~self.is_main & ~self.is_out1 # 근무지 단위 연속 금지 대상
+        self.loc_rule[-1] = False
+
+        self.month_min = np.array([self.dept_config[d]['limit_m'][0] for d in self.departments], dtype=float)
+        self.month_max = np.array([self.dept_config[d]['limit_m'][-1] for d in self.departments], dtype=float)
+
+        ## 진료과 -> 그룹 (D x K) 및 그룹별 인력 한도
+        self.group_matrix = np.zeros((D, len(self.group_keys)), dtype=int)
+        for k, key in enumerate(self.group_keys):
+            for d in department_group_map[key]:
+                self.group_matrix[self.departments.index(d), k] = 1
+        self.group_min = np.array([sum(self.dept_config[d]['limit_i'][0] for d in department_group_map[k]) for k in self.group_keys], dtype=float)
+        self.group_max = np.array([sum(self.dept_config[d]['limit_i'][-1] for d in department_group_map[k]) for k in self.group_keys], dtype=float)
+
+    '''검증 실행'''
+    def validate(self, roster):
+        '''roster: Employee x Month (reset_index 된 세션 데이터도 가능)
+        반환: {'masks': 규칙별 bool 데이터프레임, 'mask': 전체 위반 칸, 'violations': 위반 내용 목록}'''
+        roster = self._as_roster(roster)
+        employees, months = list(roster.index), list(roster.columns)
+        values = roster.to_numpy(dtype=object)
+        E, T, D = len(employees), len(months), len(self.departments)
+
+        ## 진료과 코드 (E x T), 미배치/알 수 없는 값은 -1 -> 속성 배열의 마지막 칸
+        codes = pd.Categorical(values.ravel(), categories=self.departments).codes.reshape(E, T).astype(int)
+        valid = codes >= 0
+        empty = pd.isna(values) | (values == '')
+        onehot = codes[:, :, None] == np.arange(D)
+        masks, violations = {}, []
+
+        ## (제약조건 1) 월별 1곳 배치
+        masks['Assignment'] = ~valid & ~(values == LEAVE)
+        for e, t in zip(*np.nonzero(masks['Assignment'])):
+            reason = '미배치' if empty[e, t] else f"알 수 없는 진료과 '{values[e, t]}'"
+            violations.append(f"Assignment_1Dept_Per_Month_{employees[e]}_{months[t]}: {reason}")
+
+        ## (제약조건 2) 월별 진료과 인원
+        dept_count = onehot.sum(axis=0) # T x D
+        over_m = dept_count > self.month_max
+        under_m = dept_count < self.month_min
+        masks['Dept_Capacity_Max'] = (onehot & over_m[None]).any(axis=2)
+        masks['Dept_Capacity_Min'] = np.zeros((E, T), dtype=bool) # 부족 인원은 칸으로 표시 불가 -> 목록으로만
+        for t, d in zip(*np.nonzero(over_m)):
+            violations.append(f"Dept_Capacity_Max_{self.departments[d]}_{months[t]}: {dept_count[t, d]}명 > 최대 {self.month_max[d]:g}명")
+        for t, d in zip(*np.nonzero(under_m)):
+            violations.append(f"Dept_Capacity_Min_{self.departments[d]}_{months[t]}: {dept_count[t, d]}명 < 최소 {self.month_min[d]:g}명")
+
+        ## (제약조건 3) 인력별 그룹 횟수
+        member = onehot.astype(int) @ self.group_matrix # E x T x K
+        group_count = member.sum(axis=1) # E x K
+        over_g = group_count > self.group_max
+        under_g = group_count < self.group_min
+        masks['Worker_Group_Max'] = ((member > 0) & over_g[:, None, :]).any(axis=2)
+        masks['Worker_Group_Min'] = np.repeat(under_g.any(axis=1)[:, None], T, axis=1)
+        for e, k in zip(*np.nonzero(over_g)):
+            violations.append(f"Worker_Group_Max_{employees[e]}_{self.group_keys[k]}: {group_count[e, k]}회 > 최대 {self.group_max[k]:g}회")
+        for e, k in zip(*np.nonzero(under_g)):
+            violations.append(f"Worker_Group_Min_{employees[e]}_{self.group_keys[k]}: {group_count[e, k]}회 < 최소 {self.group_min[k]:g}회")
+
+        ## (제약조건 4) 파견 횟수
+        out = self.is_out[codes]
+        out_count = out.sum(axis=1)
+        over_o = out_count > self.out_group_count
+        under_o = out_count < self.out_group_count - 2
+        masks['Global_Out_Max'] = out & over_o[:, None]
+        masks['Global_Out_Min'] = np.repeat(under_o[:, None], T, axis=1)
+        for e in np.flatnonzero(over_o):
+            violations.append(f"Global_Out_Max_{employees[e]}: 파견 {out_count[e]}회 > 최대 {self.out_group_count}회")
+        for e in np.flatnonzero(under_o):
+            violations.append(f"Global_Out_Min_{employees[e]}: 파견 {out_count[e]}회 < 최소 {self.out_group_count - 2}회")
+
+        ## (제약조건 5) 연속 근무 금지 (main 은 진료과, out1 외 근무지는 근무지 단위)
+        prev, curr = codes[:, :-1], codes[:, 1:]
+        cont_dept = valid[:, 1:] & (prev == curr) & self.is_main[curr]
+        cont_loc = valid[:, 1:] & valid[:, :-1] & (self.loc_code[prev] == self.loc_code[curr]) & self.loc_rule[curr]
+        masks['No_Cont_Dept'] = self._pair_mask(cont_dept)
+        masks['No_Cont_Loc'] = self._pair_mask(cont_loc)
+        for e, t in zip(*np.nonzero(cont_dept)):
+            violations.append(f"No_Cont_Dept_{employees[e]}_{values[e, t]}_{months[t]}: {months[t]}·{months[t+1]} 연속")
+        for e, t in zip(*np.nonzero(cont_loc)):
+            loc = self.dept_config[values[e, t]]['location_group'][0]
+            violations.append(f"No_Cont_Loc_{employees[e]}_{loc}_{months[t]}: {months[t]}·{months[t+1]} 연속")
+
+        ## (제약조건 6) out1 시작: 기간마다 1명 이상이 '서로 다른 out1 두 달 + 그 외 파견 없음' 블록을 가져야 함
+        out1 = self.is_out1[codes]
+        block = out1[:, :-1] & out1[:, 1:] & (prev != curr) & (out_count == 2)[:, None]
+        starters = block.sum(axis=0)
+        missing = starters == 0
+        masks['Out1_Monthly_StarterCount'] = out1 & self._pair_mask(missing[None]) & ~self._pair_mask(block)
+        for k in np.flatnonzero(missing):
+            violations.append(f"Out1_Monthly_StarterCount_{k}: {months[k]}·{months[k+1]} out1 시작 인력 없음")
+
+        ## 결과 정리
+        mask = np.zeros((E, T), dtype=bool)
+        for name in masks:
+            mask |= masks[name]
+            masks[name] = pd.DataFrame(masks[name], index=employees, columns=months)
+        return {'masks': masks,
+                'mask': pd.DataFrame(mask, index=employees, columns=months),
+                'violations': violations}
+
+    def _as_roster(self, roster):
+        '''reset_index 된 형태(첫 열이 인력 이름)면 인덱스로 되돌림'''
+        first = roster.iloc[:, 0].astype(str)
+        if len(roster) and first.str.startswith('Worker_').all():
+            roster = roster.set_index(roster.columns[0]).rename_axis(index=None)
+        return roster
+
+    @staticmethod
+    def _pair_mask(pair):
+        '''(E x T-1) 인접 월 위반 -> 두 칸 모두 표시'''
+        mask = np.zeros((pair.shape[0], pair.shape[1] + 1), dtype=bool)
+        mask[:, :-1] |= pair
+        mask[:, 1:] |= pair
+        return mask
+
+# --------------------------------------------
+# 화면 표시
+
+def style_violations(roster, mask, color='#FECACA'):
+    '''위반 칸 배경색 표시 (st.dataframe 용 Styler)'''
+    return roster.style.apply(lambda _: np.where(mask, f'background-color: {color}', ''), axis=None)